@@ -9,12 +9,20 @@ bl_info = {
 }
 
 import bpy
+import gpu
 import os
 import time
+import hashlib
 import shutil
 import platform
+import threading
 import subprocess
+import tempfile
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from gpu_extras.batch import batch_for_shader
 from bpy.types import Operator, Panel, PropertyGroup
 from bpy.props import (
     StringProperty, IntProperty,
@@ -25,10 +33,43 @@ from bpy.props import (
 # Global Runtime State
 # =========================================================
 
-_RUNNING = False
-_TIMER = None
-_NEXT_CAPTURE_TIME = 0.0
-_LAST_INTERACTION_TIME = 0.0
+class _State:
+    __slots__ = (
+        "running", "timer", "tick", "next_capture", "last_interaction", "last_fp",
+        "session_stamp", "seq", "capturing", "parked", "move_errors",
+        "fp_offscreen", "fp_digest", "fp_hash", "io_pool",
+    )
+
+    def __init__(self):
+        self.running = False
+        self.timer = None
+        self.tick = 0.0
+        self.next_capture = 0.0
+        self.last_interaction = 0.0
+        self.last_fp = None
+        self.session_stamp = ""
+        self.seq = 0
+        self.capturing = False
+        self.parked = []
+        self.move_errors = []
+        self.fp_offscreen = None
+        self.fp_digest = None
+        self.fp_hash = None
+        self.io_pool = None
+
+
+_STATE = _State()
+# render_pre may fire off the main thread; guards running/timer transitions
+_STATE_LOCK = threading.Lock()
+
+
+def _take_timer():
+    """Atomically end the session and hand back its timer (or None)."""
+    st = _STATE
+    with _STATE_LOCK:
+        t, st.timer = st.timer, None
+        st.running = False
+    return t
 
 
 # =========================================================
@@ -47,8 +88,105 @@ def _resolve_dir(user_dir: str):
 
 
 def _ensure_dir(path):
-    if not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def _dir_writable(path):
+    probe = os.path.join(path, ".tl_probe")
+    try:
+        _ensure_dir(path)
+        open(probe, "wb").close()
+        os.remove(probe)
+    except OSError:
+        return False
+    return True
+
+
+def _copy_file(src, dst):
+    """copy_file_range (in-kernel, reflink on btrfs/XFS) where available, else copy2."""
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is not None:
+        try:
+            with open(src, "rb") as fs, open(dst, "wb") as fd:
+                remaining = os.fstat(fs.fileno()).st_size
+                while remaining > 0:
+                    n = copy_range(fs.fileno(), fd.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    # copy2 already uses sendfile/fcopyfile on Linux/macOS
+    shutil.copy2(src, dst)
+
+
+def _remove_quietly(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _finalize(temp_path, final_path):
+    """Move a finished frame out of the temp dir (runs on the I/O pool)."""
+    try:
+        os.replace(temp_path, final_path)
+        return
+    except OSError:
+        pass
+    try:
+        _copy_file(temp_path, final_path)
+    except OSError:
+        # A truncated JPEG would end up in the MP4 via _gather
+        _remove_quietly(final_path)
+        raise
+    _remove_quietly(temp_path)
+
+
+def _queue_finalize(temp_path, final_path):
+    fut = _STATE.io_pool.submit(_finalize, temp_path, final_path)
+    fut.add_done_callback(lambda f: _finalize_done(f, temp_path, final_path))
+
+
+def _flush_parked():
+    """Queue moves for every frame parked in the temp dir."""
+    st = _STATE
+    for temp_path, final_path in st.parked:
+        _queue_finalize(temp_path, final_path)
+    st.parked.clear()
+
+
+def _release_parked(report):
+    """Session end: move parked frames if their folder is back, else say where they are."""
+    st = _STATE
+    if not st.parked:
+        return
+    out = os.path.dirname(st.parked[0][1])
+    if _dir_writable(out):
+        _flush_parked()
+        return
+    report({'WARNING'}, f"{len(st.parked)} frames could not be written to {out}; they are in {bpy.app.tempdir}")
+    st.parked.clear()
+
+
+def _finalize_done(fut, temp_path, final_path):
+    # Pool thread: keep the frame and leave the error for the modal to report
+    err = fut.exception()
+    if err is None:
+        return
+    with _STATE_LOCK:
+        _STATE.move_errors.append((temp_path, final_path, err))
+
+
+def _take_move_errors():
+    st = _STATE
+    with _STATE_LOCK:
+        errors, st.move_errors = st.move_errors, []
+    return errors
 
 
 def _open_folder(path):
@@ -56,10 +194,15 @@ def _open_folder(path):
     system = platform.system()
     if system == "Windows":
         os.startfile(path)
-    elif system == "Darwin":
-        subprocess.Popen(["open", path])
-    else:
-        subprocess.Popen(["xdg-open", path])
+        return
+    cmd = "open" if system == "Darwin" else "xdg-open"
+    # Own session so the file manager outlives Blender
+    subprocess.Popen(
+        [cmd, path],
+        start_new_session=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
 
 def _find_viewport_region():
@@ -84,53 +227,282 @@ def _dims(key):
 # JPEG Capture
 # =========================================================
 
-def _capture_jpeg(path, width, height, quality):
+# use_file_extension is left alone: the path already ends in ".jpg", which
+# Blender keeps as-is either way, so toggling it only clobbered user config.
+_R_ATTRS = ("filepath", "resolution_x", "resolution_y", "resolution_percentage")
+_I_ATTRS = ("file_format", "color_mode", "quality")
+
+
+@contextmanager
+def _render_settings(r, img, filepath, fmt, quality, res):
+    """Temporarily apply still-output settings, restoring the user's on exit."""
+    saved_r = tuple(getattr(r, a) for a in _R_ATTRS)
+    saved_i = tuple(getattr(img, a) for a in _I_ATTRS)
+    try:
+        r.filepath = filepath
+        r.resolution_x, r.resolution_y = res
+        r.resolution_percentage = 100
+        img.file_format = fmt
+        img.color_mode = 'RGB'
+        img.quality = quality
+        yield
+    finally:
+        for a, v in zip(_R_ATTRS, saved_r):
+            setattr(r, a, v)
+        for a, v in zip(_I_ATTRS, saved_i):
+            setattr(img, a, v)
+
+
+# Leading dot hides the scratch image from the Image Editor's browse list
+_CAPTURE_IMAGE = ".TL_Capture"
+_CAPTURE_OFFSCREENS = {}
+
+
+def _capture_offscreen_for(width, height):
+    off = _CAPTURE_OFFSCREENS.get((width, height))
+    if off is None:
+        off = _CAPTURE_OFFSCREENS[(width, height)] = gpu.types.GPUOffScreen(width, height)
+    return off
+
+
+def _capture_image(width, height):
+    # Looked up by name: Python references do not survive a file load
+    img = bpy.data.images.get(_CAPTURE_IMAGE)
+    if img is not None and tuple(img.size) != (width, height):
+        bpy.data.images.remove(img)
+        img = None
+    if img is None:
+        img = bpy.data.images.new(_CAPTURE_IMAGE, width, height, alpha=False)
+        img.file_format = 'JPEG'
+    return img
+
+
+def _free_capture_image():
+    images = getattr(bpy.data, "images", None)  # restricted while quitting
+    img = images.get(_CAPTURE_IMAGE) if images is not None else None
+    if img is not None:
+        images.remove(img)
+
+
+def _fit_projection(r3d, width, height):
+    # Keep the horizontal field of view, fit the vertical one to width/height
+    proj = r3d.window_matrix.copy()
+    proj[1][1] = proj[0][0] * (width / height)
+    return proj
+
+
+def _draw_frame(width, height):
+    """Draw the 3D view once into the cached full-size offscreen (or None)."""
     win, area, region = _find_viewport_region()
     if not win:
-        return False
+        return None
+
+    space = area.spaces.active
+    r3d = space.region_3d
+    # Camera view needs the exact camera frame → leave it to render.opengl
+    if r3d.view_perspective == 'CAMERA':
+        return None
 
+    proj = _fit_projection(r3d, width, height)
+
+    try:
+        off = _capture_offscreen_for(width, height)
+        with bpy.context.temp_override(window=win, area=area, region=region):
+            off.draw_view3d(
+                win.scene, win.view_layer, space, region,
+                r3d.view_matrix, proj,
+                do_color_management=True,
+            )
+    except Exception:
+        return None
+    return off
+
+
+def _write_frame(off, path, width, height, quality):
+    buf = off.texture_color.read()
+    px = np.frombuffer(buf, dtype=np.uint8).astype(np.float32)
+    px *= 1.0 / 255.0
+    img = _capture_image(width, height)
+    img.pixels.foreach_set(px)
+    img.save(filepath=path, quality=quality)
+
+
+def _capture_opengl(win, area, region, path, width, height, quality):
     ctx = bpy.context
-    scene = ctx.scene
-    r = scene.render
-    img = r.image_settings
-
-    old = {
-        "filepath": r.filepath,
-        "file_format": img.file_format,
-        "color_mode": img.color_mode,
-        "quality": img.quality,
-        "rx": r.resolution_x,
-        "ry": r.resolution_y,
-        "rp": r.resolution_percentage,
-        "ufe": r.use_file_extension,
+    r = ctx.scene.render
+
+    ok = True
+    with _render_settings(r, r.image_settings, path, 'JPEG', quality, (width, height)):
+        try:
+            with ctx.temp_override(window=win, area=area, region=region):
+                bpy.ops.render.opengl(write_still=True, view_context=True)
+        except Exception:
+            ok = False
+    return ok
+
+
+def _capture_jpeg(path, width, height, quality, frame=None):
+    """Save a frame drawn by _draw_frame, or fall back to render.opengl.
+
+    render.opengl is only for views _draw_frame could not draw: if saving a
+    drawn frame fails (disk full, permissions), it would fail the same way.
+    """
+    _STATE.capturing = True
+    try:
+        if frame is not None:
+            try:
+                _write_frame(frame, path, width, height, quality)
+            except Exception:
+                return False
+            return os.path.exists(path)
+        win, area, region = _find_viewport_region()
+        if not win:
+            return False
+        ok = _capture_opengl(win, area, region, path, width, height, quality)
+        return ok and os.path.exists(path)
+    finally:
+        _STATE.capturing = False
+
+
+# =========================================================
+# Viewport Fingerprint
+# =========================================================
+
+_FP_SIZE = (128, 72)
+_FP_MAX_DISTANCE = 4
+
+# 8x16 luma grid of 9x8-pixel cells; buffers reused every tick
+_FP_GRID_SHAPE = (8, 16)
+_FP_GRID = np.empty(_FP_GRID_SHAPE)
+_FP_BITS = np.empty((_FP_GRID_SHAPE[0], _FP_GRID_SHAPE[1] - 1), dtype=bool)
+
+
+def _fp_offscreen():
+    st = _STATE
+    if st.fp_offscreen is None:
+        st.fp_offscreen = gpu.types.GPUOffScreen(*_FP_SIZE)
+    return st.fp_offscreen
+
+
+def _free_offscreens():
+    st = _STATE
+    if st.fp_offscreen is not None:
+        st.fp_offscreen.free()
+        st.fp_offscreen = None
+    for off in _CAPTURE_OFFSCREENS.values():
+        off.free()
+    _CAPTURE_OFFSCREENS.clear()
+    _BOX_FILTER.clear()
+
+
+_BOX_FILTER = {}
+
+_BOX_FRAG = """
+void main()
+{
+    ivec2 base = ivec2(gl_FragCoord.xy) * block;
+    vec4 acc = vec4(0.0);
+    for (int y = 0; y < block.y; y++) {
+        for (int x = 0; x < block.x; x++) {
+            acc += texelFetch(image, base + ivec2(x, y), 0);
+        }
     }
+    fragColor = acc / float(block.x * block.y);
+}
+"""
+
+
+def _box_filter():
+    """Shader + fullscreen triangle that average each block x block cell."""
+    if not _BOX_FILTER:
+        info = gpu.types.GPUShaderCreateInfo()
+        info.push_constant('IVEC2', "block")
+        info.sampler(0, 'FLOAT_2D', "image")
+        info.vertex_in(0, 'VEC2', "pos")
+        info.fragment_out(0, 'VEC4', "fragColor")
+        info.vertex_source("void main() { gl_Position = vec4(pos, 0.0, 1.0); }")
+        info.fragment_source(_BOX_FRAG)
+        shader = gpu.shader.create_from_info(info)
+        batch = batch_for_shader(shader, 'TRIS', {"pos": ((-1, -1), (3, -1), (-1, 3))})
+        _BOX_FILTER.update(shader=shader, batch=batch)
+    return _BOX_FILTER["shader"], _BOX_FILTER["batch"]
+
+
+def _downsample(src, dst):
+    """Box-filter src's colour texture into dst on the GPU.
+
+    Every source texel lands in exactly one output pixel (1920x1080 and
+    1280x720 are 15x and 10x the fingerprint size), so nothing aliases.
+    """
+    shader, batch = _box_filter()
+    block = (src.width // dst.width, src.height // dst.height)
+    with dst.bind():
+        gpu.state.blend_set('NONE')
+        shader.bind()
+        shader.uniform_int("block", block)
+        shader.uniform_sampler("image", src.texture_color)
+        batch.draw(shader)
+
+
+def _draw_small(off):
+    win, area, region = _find_viewport_region()
+    if not win:
+        return False
+    space = area.spaces.active
+    r3d = space.region_3d
+    # Same framing and colour management as _draw_frame, so hashes from
+    # both paths stay comparable
+    with bpy.context.temp_override(window=win, area=area, region=region):
+        off.draw_view3d(
+            win.scene, win.view_layer, space, region,
+            r3d.view_matrix, _fit_projection(r3d, off.width, off.height),
+            do_color_management=True,
+        )
+    return True
 
-    r.filepath = path
-    r.use_file_extension = True
-    img.file_format = 'JPEG'
-    img.color_mode = 'RGB'
-    img.quality = quality
-    r.resolution_x = width
-    r.resolution_y = height
-    r.resolution_percentage = 100
 
-    ok = True
+def _quick_viewport_fingerprint(frame=None):
+    """Return the viewport's dHash as an int (or None).
+
+    A frame from _draw_frame is blitted down on the GPU so the viewport is
+    only drawn once per tick; without one the viewport is drawn small.
+    """
+    st = _STATE
+    w, h = _FP_SIZE
+
     try:
-        with ctx.temp_override(window=win, area=area, region=region):
-            bpy.ops.render.opengl(write_still=True, view_context=True)
+        off = _fp_offscreen()
+        if frame is not None:
+            _downsample(frame, off)
+        elif not _draw_small(off):
+            return None
+        buf = off.texture_color.read()
     except Exception:
-        ok = False
+        return None
+
+    # Bit-identical frame (idle viewport) -> reuse the previous hash
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    digest = hashlib.blake2b(arr, digest_size=8).digest()
+    if digest == st.fp_digest:
+        return st.fp_hash
+
+    fp = _dhash(arr, w, h)
 
-    r.filepath = old["filepath"]
-    img.file_format = old["file_format"]
-    img.color_mode = old["color_mode"]
-    img.quality = old["quality"]
-    r.resolution_x = old["rx"]
-    r.resolution_y = old["ry"]
-    r.resolution_percentage = old["rp"]
-    r.use_file_extension = old["ufe"]
+    st.fp_digest, st.fp_hash = digest, fp
+    return fp
 
-    return ok and os.path.exists(path)
+
+def _dhash(arr, w, h):
+    """72x128 RGBA -> 8x16 mean-RGB grid in one reduction -> column-difference bits."""
+    gy, gx = _FP_GRID_SHAPE
+    cells = arr.reshape(gy, h // gy, gx, w // gx, 4)[..., :3]
+    np.mean(cells, axis=(1, 3, 4), out=_FP_GRID)
+    np.greater(_FP_GRID[:, 1:], _FP_GRID[:, :-1], out=_FP_BITS)
+    return int.from_bytes(np.packbits(_FP_BITS).tobytes(), "little")
+
+
+def _fp_distance(a, b):
+    return (a ^ b).bit_count()
 
 
 # =========================================================
@@ -190,32 +562,69 @@ def _props():
 # =========================================================
 
 def _test_capture():
-    p = _props()
-    width, height = _dims(p.resolution)
-    temp_path = os.path.join(bpy.app.tempdir, "timelapse_test.jpg")
-    ok = _capture_jpeg(temp_path, width, height, p.jpeg_quality)
-    exists = os.path.exists(temp_path)
-    if exists:
-        os.remove(temp_path)
-    return ok and exists
+    """Check the viewport can be read back and the temp dir is writable."""
+    win, area, region = _find_viewport_region()
+    if not win:
+        return False
+
+    space = area.spaces.active
+    r3d = space.region_3d
+    try:
+        off = gpu.types.GPUOffScreen(32, 32)
+        try:
+            with bpy.context.temp_override(window=win, area=area, region=region):
+                off.draw_view3d(
+                    win.scene, win.view_layer, space, region,
+                    r3d.view_matrix, r3d.window_matrix,
+                )
+            off.texture_color.read()
+        finally:
+            off.free()
+    except Exception:
+        return False
+    return _dir_writable(bpy.app.tempdir)
 
 
 # =========================================================
 # Start / Stop Operators
 # =========================================================
 
+# Poll ~4x per interval; fast only once the next slow tick would overshoot
+_TICK_FAST = 0.1
+_TICK_SLOW_MIN = 0.25
+
+
+def _slow_tick(interval):
+    return max(_TICK_SLOW_MIN, interval / 4)
+
+
+def _set_tick(wm, window, step):
+    st = _STATE
+    # Compare against our own step: Timer.time_step reads back as float32
+    with _STATE_LOCK:
+        old = st.timer
+        if old is None or st.tick == step:
+            return
+        st.timer = wm.event_timer_add(step, window=window)
+        st.tick = step
+    wm.event_timer_remove(old)
+
+
 class VIEW3D_OT_timelapse_start(Operator):
     bl_idname = "view3d.timelapse_start"
     bl_label = "Start Screenshots"
 
     def execute(self, context):
-        global _RUNNING, _TIMER, _NEXT_CAPTURE_TIME, _LAST_INTERACTION_TIME
+        st = _STATE
 
         if not bpy.data.filepath:
             self.report({'ERROR'}, "Save your .blend first.")
             return {'CANCELLED'}
 
-        if _RUNNING:
+        # A timer without running means a render stopped the last session
+        # and its modal has not cleaned up yet
+        if st.running or st.timer is not None:
+            self.report({'WARNING'}, "Screenshots are still running or stopping, try again.")
             return {'CANCELLED'}
 
         if not _test_capture():
@@ -223,26 +632,47 @@ class VIEW3D_OT_timelapse_start(Operator):
             return {'CANCELLED'}
 
         p = _props()
-        wm = context.window_manager
-        _TIMER = wm.event_timer_add(0.1, window=context.window)
+        # Frames are rendered straight into the output folder
+        out = _resolve_dir(p.output_dir)
+        if not _dir_writable(out):
+            self.report({'ERROR'}, f"Output folder is not writable: {out}")
+            return {'CANCELLED'}
 
-        _RUNNING = True
-        _NEXT_CAPTURE_TIME = time.time() + float(p.interval)
-        _LAST_INTERACTION_TIME = time.time()
+        st.next_capture = time.time() + float(p.interval)
+        st.last_interaction = time.time()
+        st.last_fp = None
+        st.session_stamp = _timestamp()
+        st.seq = 0
+        st.parked.clear()
+        _take_move_errors()
+
+        wm = context.window_manager
+        with _STATE_LOCK:
+            st.tick = _slow_tick(p.interval)
+            st.timer = wm.event_timer_add(st.tick, window=context.window)
+            st.running = True
+        _hook_render_stop()
 
         wm.modal_handler_add(self)
         return {'RUNNING_MODAL'}
 
     def modal(self, context, event):
-        global _RUNNING, _TIMER, _NEXT_CAPTURE_TIME, _LAST_INTERACTION_TIME
-
-        if not _RUNNING:
+        st = _STATE
+
+        if not st.running:
+            t = _take_timer()
+            if t is not None:
+                context.window_manager.event_timer_remove(t)
+            _unhook_render_stop()
+            _free_capture_image()
+            _free_offscreens()
+            _release_parked(self.report)
             return {'CANCELLED'}
 
         now = time.time()
 
         if event.type != "TIMER":
-            _LAST_INTERACTION_TIME = time.time()
+            st.last_interaction = now
             return {'PASS_THROUGH'}
         
 
@@ -250,54 +680,89 @@ class VIEW3D_OT_timelapse_start(Operator):
 
         p = _props()
 
-        # SAFETY: do not take screenshots during actual renders
-        if bpy.app.is_job_running("RENDER"):
+        # Failed background moves keep their temp file: park them for a retry
+        failed = _take_move_errors()
+        if failed:
+            st.parked.extend((temp_path, final_path) for temp_path, final_path, _ in failed)
+            self.report({'WARNING'}, f"Could not move {len(failed)} frames: {failed[-1][2]}")
+
+        # SAFETY: do not take screenshots during renders, compositing,
+        # locked UI, or while the previous OpenGL capture is still running
+        if (st.capturing
+                or bpy.app.is_job_running("RENDER")
+                or bpy.app.is_job_running("COMPOSITE")
+                or getattr(context.window_manager, "is_interface_locked", False)):
             return {'PASS_THROUGH'}
 
         # 1. Too early → skip
-        if now < _NEXT_CAPTURE_TIME:
+        slow = _slow_tick(p.interval)
+        if now < st.next_capture:
+            far = now + slow <= st.next_capture
+            _set_tick(context.window_manager, context.window,
+                      slow if far else _TICK_FAST)
             return {'PASS_THROUGH'}
 
         # 2. Skip if user acted recently (0.3 seconds)
-        if (now - _LAST_INTERACTION_TIME) < 0.3:
+        if (now - st.last_interaction) < 0.3:
             # Allow only limited skip = interval * 1.5
-            if now < (_NEXT_CAPTURE_TIME + p.interval * 1.5):
+            if now < (st.next_capture + p.interval * 1.5):
                 return {'PASS_THROUGH'}
             # ELSE → force capture (implicit)
 
         # 3. Pause if user away too long (interval * 4)
-        if (now - _LAST_INTERACTION_TIME) > (p.interval * 4):
+        if (now - st.last_interaction) > (p.interval * 4):
+            # Nothing to do until the user returns → back to the slow tick
+            _set_tick(context.window_manager, context.window, slow)
             return {'PASS_THROUGH'}
 
-        # 4. Perform capture
+        # 4. Draw once; skip if the viewport looks the same as the last saved frame
         width, height = _dims(p.resolution)
-        temp_path = os.path.join(
-            bpy.app.tempdir,
-            f"{p.prefix}_{_timestamp()}.jpg"
-        )
+        frame = _draw_frame(width, height)
+        fp = _quick_viewport_fingerprint(frame)
+        if (fp is not None and st.last_fp is not None
+                and _fp_distance(fp, st.last_fp) <= _FP_MAX_DISTANCE):
+            st.next_capture = now + float(p.interval)
+            return {'PASS_THROUGH'}
 
-        ok = _capture_jpeg(temp_path, width, height, p.jpeg_quality)
+        # 5. Perform capture
+        st.seq += 1
+        name = f"{p.prefix}_{st.session_stamp}_{st.seq:06d}.jpg"
+        out = _resolve_dir(p.output_dir)
+        final_path = os.path.join(out, name)
 
-        if ok and os.path.exists(temp_path):
-            out = _resolve_dir(p.output_dir)
+        try:
             _ensure_dir(out)
-            final_path = os.path.join(out, os.path.basename(temp_path))
-            try:
-                os.replace(temp_path, final_path)
-            except:
-                shutil.copy2(temp_path, final_path)
-                os.remove(temp_path)
-
-        # 5. Reset next-capture timer (prevents spam)
-        _NEXT_CAPTURE_TIME = now + float(p.interval)
+            ok = _capture_jpeg(final_path, width, height, p.jpeg_quality, frame)
+        except OSError:
+            ok = False
+
+        if ok:
+            st.last_fp = fp
+            # The folder just took a write, so parked frames can follow now
+            _flush_parked()
+        else:
+            # Output refused this frame (e.g. a share dropped out after Start):
+            # park it in the temp dir until a direct write succeeds again.
+            # last_fp stays put so later frames are not skipped against it.
+            temp_path = os.path.join(bpy.app.tempdir, name)
+            if _capture_jpeg(temp_path, width, height, p.jpeg_quality, frame):
+                if not st.parked:
+                    self.report({'WARNING'}, f"Output folder unavailable, holding frames in temp: {out}")
+                st.parked.append((temp_path, final_path))
+
+        # 6. Reset next-capture timer (prevents spam)
+        st.next_capture = now + float(p.interval)
 
         return {'PASS_THROUGH'}
 
     def cancel(self, context):
-        global _RUNNING, _TIMER
-        if _TIMER:
-            context.window_manager.event_timer_remove(_TIMER)
-        _RUNNING = False
+        t = _take_timer()
+        if t is not None:
+            context.window_manager.event_timer_remove(t)
+        _unhook_render_stop()
+        _free_capture_image()
+        _free_offscreens()
+        _release_parked(self.report)
 
 
 class VIEW3D_OT_timelapse_stop(Operator):
@@ -305,10 +770,13 @@ class VIEW3D_OT_timelapse_stop(Operator):
     bl_label = "Stop Screenshots"
 
     def execute(self, context):
-        global _RUNNING, _TIMER
-        if _TIMER:
-            context.window_manager.event_timer_remove(_TIMER)
-        _RUNNING = False
+        t = _take_timer()
+        if t is not None:
+            context.window_manager.event_timer_remove(t)
+        _unhook_render_stop()
+        _free_capture_image()
+        _free_offscreens()
+        _release_parked(self.report)
         return {'FINISHED'}
 
 
@@ -317,18 +785,90 @@ class VIEW3D_OT_timelapse_stop(Operator):
 # MP4 Assembly
 # =========================================================
 
+_JPG_SUFFIXES = (".jpg", ".JPG", ".jpeg", ".JPEG")
+
+
 def _gather(directory, prefix):
     directory = _resolve_dir(directory)
     if not os.path.exists(directory):
         return directory, []
-    files = sorted(
-        f for f in os.listdir(directory)
-        if f.startswith(prefix) and f.lower().endswith(".jpg")
-    )
+    with os.scandir(directory) as it:
+        files = [
+            e.name for e in it
+            if e.name.startswith(prefix)
+            and e.name.endswith(_JPG_SUFFIXES)
+            and e.is_file(follow_symlinks=False)
+        ]
+    files.sort()
     return directory, files
 
 
+# Same CRF values Blender uses for its H.264 quality presets
+_CRF = {'HIGH': 20, 'MEDIUM': 23, 'LOW': 26}
+
+
+def _ffmpeg_binary():
+    return shutil.which("ffmpeg")
+
+
+def _concat_entry(path):
+    return "file '" + path.replace("'", "'\\''") + "'\n"
+
+
+def _start_ffmpeg(ffmpeg, directory, files, prefix, width, height, fps, crf):
+    """Launch ffmpeg on the frames via the concat demuxer.
+
+    Returns (proc, out, listfile, logfile). stderr goes to logfile rather
+    than a pipe, so a chatty ffmpeg can never block on a full pipe buffer.
+    Both temp files are unique per run, so concurrent encodes stay apart.
+    """
+    fd, listfile = tempfile.mkstemp(prefix=f"{prefix}_", suffix=".txt", dir=bpy.app.tempdir)
+    duration = f"duration {1.0 / fps:.6f}\n"
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for fname in files:
+            f.write(_concat_entry(os.path.join(directory, fname)))
+            f.write(duration)
+        # concat only honours the last duration if the file is listed again
+        f.write(_concat_entry(os.path.join(directory, files[-1])))
+
+    out = os.path.join(directory, f"{prefix}_{_timestamp()}.mp4")
+    cmd = [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-f", "concat", "-safe", "0", "-i", listfile,
+        "-r", str(fps),
+        "-vf", f"scale={width}:{height}",
+        "-c:v", "libx264", "-crf", str(_CRF.get(crf, 23)),
+        "-preset", "veryfast", "-threads", "0",
+        "-pix_fmt", "yuv420p",
+        "-movflags", "+faststart",
+        out,
+    ]
+    fd, logfile = tempfile.mkstemp(prefix=f"{prefix}_", suffix=".log", dir=bpy.app.tempdir)
+    try:
+        with os.fdopen(fd, "wb") as log:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=log,
+            )
+    except OSError:
+        _remove_quietly(listfile, logfile)
+        raise
+    return proc, out, listfile, logfile
+
+
+def _last_log_line(path):
+    try:
+        with open(path, "rb") as f:
+            lines = f.read().decode(errors="replace").strip().splitlines()
+    except OSError:
+        return ""
+    return lines[-1] if lines else ""
+
+
 def _make_mp4(directory, prefix, width, height, fps, crf, report):
+    """Blocking fallback through Blender's own VSE when no ffmpeg binary exists."""
     directory, files = _gather(directory, prefix)
     if not files:
         report({'ERROR'}, "No JPG files found.")
@@ -380,11 +920,63 @@ class VIEW3D_OT_timelapse_make_mp4(Operator):
     def execute(self, context):
         p = _props()
         width, height = _dims(p.resolution)
-        ok = _make_mp4(
-            p.output_dir, p.prefix, width, height,
-            p.mp4_fps, p.mp4_quality, self.report
-        )
-        return {'FINISHED'} if ok else {'CANCELLED'}
+
+        ffmpeg = _ffmpeg_binary()
+        if not ffmpeg:
+            ok = _make_mp4(
+                p.output_dir, p.prefix, width, height,
+                p.mp4_fps, p.mp4_quality, self.report
+            )
+            return {'FINISHED'} if ok else {'CANCELLED'}
+
+        directory, files = _gather(p.output_dir, p.prefix)
+        if not files:
+            self.report({'ERROR'}, "No JPG files found.")
+            return {'CANCELLED'}
+
+        try:
+            self._proc, self._out, self._listfile, self._logfile = _start_ffmpeg(
+                ffmpeg, directory, files, p.prefix, width, height,
+                p.mp4_fps, p.mp4_quality
+            )
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not start ffmpeg: {e}")
+            return {'CANCELLED'}
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.5, window=context.window)
+        wm.modal_handler_add(self)
+        self.report({'INFO'}, f"Encoding {len(files)} frames...")
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type != "TIMER" or self._proc.poll() is None:
+            return {'PASS_THROUGH'}
+
+        context.window_manager.event_timer_remove(self._timer)
+        err = _last_log_line(self._logfile)
+        _remove_quietly(self._listfile, self._logfile)
+
+        if self._proc.returncode != 0:
+            _remove_quietly(self._out)
+            self.report({'ERROR'}, "ffmpeg failed: " + (err or "unknown error"))
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Saved: {self._out}")
+        return {'FINISHED'}
+
+    def cancel(self, context):
+        # File load or window close: stop ffmpeg and drop the half-written MP4
+        context.window_manager.event_timer_remove(self._timer)
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+            _remove_quietly(self._out)
+        _remove_quietly(self._listfile, self._logfile)
 
 
 # =========================================================
@@ -416,13 +1008,17 @@ class VIEW3D_PT_timelapse(Panel):
         row = layout.row()
         row.scale_y = 1.4
 
-        if _RUNNING:
+        if _STATE.running:
             row.alert = True
             row.operator("view3d.timelapse_stop", text="Stop", icon="PAUSE")
         else:
             row.operator("view3d.timelapse_start", text="Start", icon="REC")
 
 
+_CAPTURE_PROPS = ("output_dir", "prefix", "interval", "jpeg_quality", "resolution")
+_MP4_PROPS = ("mp4_fps", "mp4_quality")
+
+
 class VIEW3D_PT_timelapse_options(Panel):
     bl_label = "Options"
     bl_parent_id = "VIEW3D_PT_timelapse"
@@ -434,19 +1030,18 @@ class VIEW3D_PT_timelapse_options(Panel):
     def draw(self, context):
         p = _props()
         layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
 
         col = layout.column(align=True)
-        col.prop(p, "output_dir")
-        col.prop(p, "prefix")
-        col.prop(p, "interval")
-        col.prop(p, "jpeg_quality")
-        col.prop(p, "resolution")
+        for pid in _CAPTURE_PROPS:
+            col.prop(p, pid)
 
         layout.separator()
 
         col = layout.column(align=True)
-        col.prop(p, "mp4_fps")
-        col.prop(p, "mp4_quality")
+        for pid in _MP4_PROPS:
+            col.prop(p, pid)
         col.operator(
             "view3d.timelapse_make_mp4",
             text="Make MP4",
@@ -466,10 +1061,12 @@ class VIEW3D_PT_timelapse_options(Panel):
 # =========================================================
 
 def _header_badge(self, context):
-    if not _RUNNING:
-        row = self.layout.row()
-        row.alert = True
-        row.label(text="NOT RECORDING")
+    # Warning badge: nothing to draw while recording
+    if _STATE.running:
+        return
+    row = self.layout.row()
+    row.alert = True
+    row.label(text="NOT RECORDING")
 
 
 # =========================================================
@@ -486,44 +1083,74 @@ classes = (
     VIEW3D_PT_timelapse_options,
 )
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
 def _stop_timelapse_for_render(scene):
     """Automatically stop timelapse when any render starts."""
-    global _RUNNING, _TIMER
+    st = _STATE
 
-    if not _RUNNING:
+    if not st.running:
         return
 
-    wm = bpy.context.window_manager
+    # May run on the render job thread: only flip the flag here. The modal
+    # (main thread) takes and removes the timer and unhooks this handler on
+    # its next event; removing it while Blender walks render_pre would also
+    # skip the next handler.
+    with _STATE_LOCK:
+        st.running = False
 
-    if _TIMER:
-        try:
-            wm.event_timer_remove(_TIMER)
-        except:
-            pass
-        _TIMER = None
 
-    _RUNNING = False
+def _drop_hooks(funcs, fn):
+    """Remove fn and any copy of it left by an earlier load of this add-on.
+
+    A reload creates new function objects, so stale hooks are matched by
+    module and qualified name rather than identity.
+    """
+    key = (fn.__module__, fn.__qualname__)
+    funcs[:] = [
+        f for f in funcs
+        if (getattr(f, "__module__", None), getattr(f, "__qualname__", None)) != key
+    ]
+
 
+def _hook_render_stop():
+    _drop_hooks(bpy.app.handlers.render_pre, _stop_timelapse_for_render)
+    bpy.app.handlers.render_pre.append(_stop_timelapse_for_render)
+
+
+def _unhook_render_stop():
+    try:
+        bpy.app.handlers.render_pre.remove(_stop_timelapse_for_render)
+    except ValueError:
+        pass
 
-    
 
 def register():
-    for c in classes:
-        bpy.utils.register_class(c)
+    _STATE.io_pool = ThreadPoolExecutor(max_workers=1)
+    _register_classes()
     bpy.types.Scene.timelapse_props = bpy.props.PointerProperty(type=TL_Props)
+    # Idempotent: a failed unregister must not leave duplicate hooks behind
+    _drop_hooks(bpy.types.VIEW3D_HT_header._dyn_ui_initialize(), _header_badge)
     bpy.types.VIEW3D_HT_header.prepend(_header_badge)
-    bpy.app.handlers.render_pre.append(_stop_timelapse_for_render)
+    _drop_hooks(bpy.app.handlers.render_pre, _stop_timelapse_for_render)
 
 
 def unregister():
+    st = _STATE
+
     bpy.types.VIEW3D_HT_header.remove(_header_badge)
     del bpy.types.Scene.timelapse_props
-    for c in reversed(classes):
-        bpy.utils.unregister_class(c)
+    _unregister_classes()
 
     # NEW: remove render-pre handler if present
-    if _stop_timelapse_for_render in bpy.app.handlers.render_pre:
-        bpy.app.handlers.render_pre.remove(_stop_timelapse_for_render)
+    _unhook_render_stop()
+
+    _free_offscreens()
+    _free_capture_image()
+
+    if st.io_pool is not None:
+        st.io_pool.shutdown(wait=False)
+        st.io_pool = None
 
 if __name__ == "__main__":
     register()